@@ -1,25 +1,36 @@
 import pygame
 import math
+import numpy as np
+
+from physics_numba import gravity_accel, step_orbit
 
 # --- CONFIGURACIÓN TÉCNICA (Primeros Principios) ---
 MU = 1000000      # Parámetro gravitacional
 R_INNER = 100     # Órbita de estacionamiento (px)
 R_OUTER = 300     # Órbita objetivo (px)
 WIDTH, HEIGHT = 800, 600
-CENTER = pygame.Vector2(WIDTH // 2, HEIGHT // 2)
+CX, CY = WIDTH // 2, HEIGHT // 2
+CENTER_T = (CX, CY)  # Tupla: pygame.draw la acepta sin conversión de Vector2
+PATH_LEN = 1000    # Muestras de la estela (ring buffer)
 
 class OrbitalState:
-    """Manejo de Vectores de Estado para Mecánica Orbital."""
+    """Manejo de Vectores de Estado para Mecánica Orbital (escalares, sin Vector2)."""
     def __init__(self, pos, vel):
-        self.r = pygame.Vector2(pos)
-        self.v = pygame.Vector2(vel)
+        self.rx, self.ry = float(pos[0]), float(pos[1])
+        self.vx, self.vy = float(vel[0]), float(vel[1])
+        # Magnitudes cacheadas: se recalculan una vez por paso en step()
+        self.r_mag = math.hypot(self.rx, self.ry)
+        self.v_mag = math.hypot(self.vx, self.vy)
+        # Aceleración del último paso (Velocity-Verlet la reutiliza)
+        self.ax, self.ay = gravity_accel(self.rx, self.ry, MU)
 
 class MissionSequencer:
     """Sistema de Guiado Robusto (GNC)."""
     def __init__(self):
-        self.dv1, self.dv2 = self._calculate_deltas()
+        self.dv1, self.dv2, self.t_burn2 = self._calculate_deltas()
         self.stage = "PARKED"
-        self.last_r_mag = R_INNER
+        self.t = 0.0  # Tiempo desde la inyección (TMI)
+        self.done2 = False
 
     def _calculate_deltas(self):
         v_inner = math.sqrt(MU / R_INNER)
@@ -27,68 +38,93 @@ class MissionSequencer:
         a_trans = (R_INNER + R_OUTER) / 2
         v_peri = math.sqrt(MU * (2 / R_INNER - 1 / a_trans))
         v_apo = math.sqrt(MU * (2 / R_OUTER - 1 / a_trans))
-        return (v_peri - v_inner), (v_outer - v_apo)
-
-    def update(self, ship):
-        r_mag = ship.state.r.length()
-        
-        # Maniobra 1: Inyección (Periapsis)
-        # Si estamos estacionados y detectamos que estamos cerca del radio inicial
-        if self.stage == "PARKED":
-            ship.apply_impulse(self.dv1)
-            self.stage = "TRANSFERRING"
-            print(f"EVENT: TMI Executed at r={r_mag:.2f}")
-
-        # Maniobra 2: Circularización (Apogeo)
-        # Lógica: Si estamos transfiriendo y la distancia EMPIEZA A BAJAR, 
-        # significa que acabamos de pasar el Apogeo.
-        elif self.stage == "TRANSFERRING":
-            # Detectamos que cruzamos el eje (x < 0) y que r_mag ya no crece
-            if ship.state.r.x < 0 and r_mag < self.last_r_mag:
-                ship.apply_impulse(self.dv2)
-                self.stage = "TARGET_ORBIT"
-                print(f"EVENT: Circularization at r={r_mag:.2f}")
-
-        self.last_r_mag = r_mag
+        # Tiempo de transferencia: medio periodo de la elipse (Kepler)
+        t_trans = math.pi * math.sqrt(a_trans**3 / MU)
+        return (v_peri - v_inner), (v_outer - v_apo), t_trans
+
+    def start(self, ship):
+        # Maniobra 1: Inyección (Periapsis) en t = 0, antes del primer paso,
+        # con la nave exactamente en r = R_INNER
+        ship.apply_impulse(self.dv1)
+        self.stage = "TRANSFERRING"
+        print(f"EVENT: TMI Executed at r={ship.state.r_mag:.2f}")
+
+    def update(self, ship, dt):
+        # Maniobra 2: Circularización (Apogeo), programada analíticamente
+        # t_burn2 después de la TMI: sin detectar el apogeo en cada frame
+        self.t += dt
+        if self.t >= self.t_burn2 and not self.done2:
+            ship.apply_impulse(self.dv2)
+            self.stage = "TARGET_ORBIT"
+            self.done2 = True
+            print(f"EVENT: Circularization at r={ship.state.r_mag:.2f}")
 
 class SpacecraftPro:
     def __init__(self):
         # Iniciar en órbita circular interna
         v_init = math.sqrt(MU / R_INNER)
         self.state = OrbitalState((R_INNER, 0), (0, v_init))
-        self.path = []
+        self.path = np.empty((PATH_LEN, 2), dtype=np.float32)  # Coordenadas de mundo
+        self.path_idx = 0
+        self.path_full = False
 
     def apply_impulse(self, dv_mag):
-        if self.state.v.length() > 0:
-            unit_v = self.state.v.normalize()
-            self.state.v += unit_v * dv_mag
+        state = self.state
+        v_mag = state.v_mag
+        if v_mag > 0:
+            scale = dv_mag / v_mag
+            state.vx += state.vx * scale
+            state.vy += state.vy * scale
+            state.v_mag = abs(v_mag + dv_mag)
 
     def step(self, dt):
         # Física: Aceleración gravitacional a = - (mu / r^3) * r
-        r_mag = self.state.r.length()
-        accel = -MU / (r_mag**3) * self.state.r
-        
-        # Integración Semi-implícita de Euler
-        self.state.v += accel * dt
-        self.state.r += self.state.v * dt
+        # Integración Velocity-Verlet (núcleo compilado)
+        state = self.state
+        state.rx, state.ry, state.vx, state.vy, state.ax, state.ay = step_orbit(
+            state.rx, state.ry, state.vx, state.vy, state.ax, state.ay, dt, MU)
+        state.r_mag = math.hypot(state.rx, state.ry)
+        state.v_mag = math.hypot(state.vx, state.vy)
         
         # Guardar estela para visualización
-        self.path.append((int(self.state.r.x + CENTER.x), int(self.state.r.y + CENTER.y)))
-        if len(self.path) > 1000: self.path.pop(0)
+        self.path[self.path_idx] = (state.rx, state.ry)
+        self.path_idx = (self.path_idx + 1) % PATH_LEN
+        if self.path_idx == 0: self.path_full = True
+
+    def path_points(self):
+        """Estela en píxeles y en orden cronológico (de la muestra más antigua a la más reciente)."""
+        if not self.path_full:
+            world = self.path[:self.path_idx]
+        else:
+            world = np.concatenate((self.path[self.path_idx:], self.path[:self.path_idx]))
+        # Conversión a píxeles de toda la estela en una sola pasada vectorizada
+        return (world + CENTER_T).astype(np.int32)
 
 def main():
     pygame.init()
     screen = pygame.display.set_mode((WIDTH, HEIGHT))
     pygame.display.set_caption("Oracle Tech Demo: Automated Hohmann Transfer")
-    clock = pygame.time.Clock()
     font = pygame.font.SysFont("Consolas", 16)
+    ui_color = (0, 255, 150)
+    # Línea estática (R_OUTER es constante): se rasteriza una sola vez
+    target_surf = font.render(f"Target: R={R_OUTER}", True, ui_color)
+    # Panel de telemetría: una sola superficie, re-rasterizada solo si cambia
+    text_surface = pygame.Surface((300, 4 * 20), pygame.SRCALPHA)
+    last_telemetry = None
 
     ship = SpacecraftPro()
     sequencer = MissionSequencer()
+    sequencer.start(ship)
+    # Compilar los núcleos Numba ahora (paso con dt=0, resultado descartado)
+    # para que el primer frame no arrastre el tiempo de compilación como un dt enorme
+    state = ship.state
+    step_orbit(state.rx, state.ry, state.vx, state.vy, state.ax, state.ay, 0.0, MU)
 
+    clock = pygame.time.Clock()
     running = True
     while running:
         dt = clock.tick(60) / 1000.0
+        if dt > 0.1: dt = 0.1
         sim_dt = dt * 10 # Aceleración de tiempo para la simulación
 
         for event in pygame.event.get():
@@ -97,36 +133,40 @@ def main():
 
         # --- Lógica ---
         ship.step(sim_dt)
-        sequencer.update(ship)
+        sequencer.update(ship, sim_dt)
 
         # --- Renderizado ---
         screen.fill((5, 5, 15)) # Negro espacio
         
         # Dibujar Orbits de Referencia
-        pygame.draw.circle(screen, (30, 30, 50), CENTER, R_INNER, 1)
-        pygame.draw.circle(screen, (30, 30, 50), CENTER, R_OUTER, 1)
+        pygame.draw.circle(screen, (30, 30, 50), CENTER_T, R_INNER, 1)
+        pygame.draw.circle(screen, (30, 30, 50), CENTER_T, R_OUTER, 1)
         
         # Planeta Central
-        pygame.draw.circle(screen, (100, 150, 255), CENTER, 15)
+        pygame.draw.circle(screen, (100, 150, 255), CENTER_T, 15)
         
         # Estela y Nave
-        if len(ship.path) > 2:
-            pygame.draw.lines(screen, (255, 100, 0), False, ship.path, 1)
+        path = ship.path_points()
+        if len(path) > 2:
+            pygame.draw.lines(screen, (255, 100, 0), False, path.tolist(), 1)
         
-        ship_pos = (int(ship.state.r.x + CENTER.x), int(ship.state.r.y + CENTER.y))
+        ship_pos = (int(ship.state.rx + CX), int(ship.state.ry + CY))
         pygame.draw.circle(screen, (255, 255, 255), ship_pos, 4)
 
         # UI / Telemetría
-        ui_color = (0, 255, 150)
-        telemetry = [
-            f"Stage: {sequencer.stage}",
-            f"Altitude: {ship.state.r.length():.2f} px",
-            f"Velocity: {ship.state.v.length():.2f} px/s",
-            f"Target: R={R_OUTER}"
-        ]
-        for i, text in enumerate(telemetry):
-            surf = font.render(text, True, ui_color)
-            screen.blit(surf, (10, 10 + i * 20))
+        cur = (sequencer.stage, round(ship.state.r_mag), round(ship.state.v_mag))
+        if cur != last_telemetry:
+            last_telemetry = cur
+            telemetry = [
+                f"Stage: {cur[0]}",
+                f"Altitude: {cur[1]} px",
+                f"Velocity: {cur[2]} px/s"
+            ]
+            text_surface.fill((0, 0, 0, 0))
+            for i, text in enumerate(telemetry):
+                text_surface.blit(font.render(text, True, ui_color), (0, i * 20))
+            text_surface.blit(target_surf, (0, len(telemetry) * 20))
+        screen.blit(text_surface, (10, 10))
 
         pygame.display.flip()
 
@@ -0,0 +1,83 @@
+import math
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:
+    # Sin Numba: mismas funciones ejecutadas en Python puro
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]) and not kwargs:
+            return args[0]
+        return lambda func: func
+
+# --- NÚCLEOS DE INTEGRACIÓN COMPILADOS (Numba) ---
+# Solo aritmética escalar: nada de pygame/matplotlib dentro de la región JIT.
+
+@njit(cache=True, fastmath=True)
+def step_rocket(y, v, m_fuel, u_cmd, dt, m_dry, max_thrust, isp, g0, rho, cd, area, g):
+    """Paso Semi-Implicit Euler del descenso vertical. Devuelve (y, v, m_fuel, thrust)."""
+    # 1. Gestión de Masa y Empuje
+    thrust = max(0.0, min(u_cmd, max_thrust))
+    if m_fuel <= 0.0:
+        thrust = 0.0
+
+    total_mass = m_dry + m_fuel
+    # Consumo de combustible basado en la ecuación del cohete
+    fuel_burn = (thrust / (isp * g0)) * dt
+    m_fuel = max(0.0, m_fuel - fuel_burn)
+
+    # 2. Cálculo de Fuerzas
+    drag = -0.5 * rho * v * abs(v) * cd * area
+    gravity_force = -total_mass * g
+    acceleration = (gravity_force + drag + thrust) / total_mass
+
+    # 3. SEMI-IMPLICIT EULER (V antes que Y)
+    v += acceleration * dt
+    y += v * dt
+
+    if y < 0.0:
+        y = 0.0
+        v = 0.0
+    return y, v, m_fuel, thrust
+
+@njit(cache=True, fastmath=True)
+def gravity_accel(rx, ry, mu):
+    """Aceleración gravitacional a = -(mu / r^3) * r. Devuelve (ax, ay).
+
+    Acepta escalares (una nave) o arrays NumPy (N naves, barridos de parámetros).
+    """
+    r2 = rx * rx + ry * ry
+    inv_r3_neg = -mu / (r2 * np.sqrt(r2))
+    return inv_r3_neg * rx, inv_r3_neg * ry
+
+@njit(cache=True, fastmath=True)
+def step_orbit(rx, ry, vx, vy, ax, ay, dt, mu):
+    """Paso Velocity-Verlet (simpléctico) bajo gravedad central.
+
+    Recibe la aceleración del paso anterior y devuelve (rx, ry, vx, vy, ax, ay),
+    así cada paso evalúa la gravedad una sola vez. Acepta escalares o arrays
+    NumPy de N naves; con arrays, rx/ry/vx/vy se actualizan además in situ.
+    Para el primer paso, siembra ax/ay con gravity_accel(rx, ry, mu).
+    """
+    half_dt2 = 0.5 * dt * dt
+    rx += vx * dt + ax * half_dt2
+    ry += vy * dt + ay * half_dt2
+    ax_new, ay_new = gravity_accel(rx, ry, mu)
+    vx += 0.5 * (ax + ax_new) * dt
+    vy += 0.5 * (ay + ay_new) * dt
+    return rx, ry, vx, vy, ax_new, ay_new
+
+if __name__ == "__main__":
+    # Verificación: la ruta vectorizada (N naves) coincide con la escalar
+    MU, DT, N_STEPS = 1000000, 1 / 6, 500
+    r0 = np.array([100.0, 150.0, 200.0])
+    rx, ry = r0.copy(), np.zeros(3)
+    vx, vy = np.zeros(3), np.sqrt(MU / r0) * 1.2
+    ax, ay = gravity_accel(rx, ry, MU)
+    scalar = [(rx[k], ry[k], vx[k], vy[k], ax[k], ay[k]) for k in range(3)]
+    for _ in range(N_STEPS):
+        rx, ry, vx, vy, ax, ay = step_orbit(rx, ry, vx, vy, ax, ay, DT, MU)
+        scalar = [step_orbit(*s, DT, MU) for s in scalar]
+    err = max(abs(rx[k] - scalar[k][0]) + abs(ry[k] - scalar[k][1]) for k in range(3))
+    print(f"step_orbit escalar vs vectorizado: error máximo = {err:.3e}")
+    assert err < 1e-6
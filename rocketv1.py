@@ -1,12 +1,19 @@
 import pygame
 import math
 
+from physics_numba import step_rocket
+
 # --- CONSTANTES FÍSICAS (MARTE) ---
 GRAVITY_MARS = 3.71
 ATM_DENSITY_MARS = 0.020
 ISP = 300
 G0 = 9.80665
 
+# --- DASHBOARD ---
+BG_COLOR = (10, 10, 15)
+MARS_COLOR = (135, 62, 35)
+MARS_RECT = pygame.Rect(0, 650, 400, 50)
+
 class PIDController:
     """Controlador industrial con Anti-Windup y Derivada Filtrada."""
     def __init__(self, kp, ki, kd, setpoint=0):
@@ -18,10 +25,13 @@ class PIDController:
     def compute(self, current_val, dt):
         error = self.setpoint - current_val
         # Anti-Windup: Evita que la integral crezca infinitamente si el motor satura
-        self.integral = max(-100, min(self.integral + error * dt, 100))
-        
+        integral = self.integral + error * dt
+        if integral > 100: integral = 100
+        elif integral < -100: integral = -100
+
         derivative = (error - self.prev_error) / dt
-        output = (self.kp * error) + (self.ki * self.integral) + (self.kd * derivative)
+        output = self.kp * error + self.ki * integral + self.kd * derivative
+        self.integral = integral
         self.prev_error = error
         return output
 
@@ -41,48 +51,44 @@ class RocketSimulation:
         if self.y <= 0:
             return False # Ground contact
 
-        # 1. Gestión de Masa y Empuje
-        self.thrust = max(0, min(u_cmd, self.max_thrust))
-        if self.m_fuel <= 0:
-            self.thrust = 0
-            
-        total_mass = self.m_dry + self.m_fuel
-        # Consumo de combustible basado en la ecuación del cohete
-        fuel_burn = (self.thrust / (ISP * G0)) * dt
-        self.m_fuel = max(0, self.m_fuel - fuel_burn)
-
-        # 2. Cálculo de Fuerzas
-        drag = -0.5 * ATM_DENSITY_MARS * self.v * abs(self.v) * self.cd * self.area
-        gravity_force = -total_mass * GRAVITY_MARS
-        net_force = gravity_force + drag + self.thrust
-        acceleration = net_force / total_mass
-
-        # 3. SEMI-IMPLICIT EULER (V antes que Y)
-        self.v += acceleration * dt
-        self.y += self.v * dt
-
-        if self.y < 0:
-            self.y = 0
-            self.v = 0
+        self.y, self.v, self.m_fuel, self.thrust = step_rocket(
+            self.y, self.v, self.m_fuel, u_cmd, dt,
+            self.m_dry, self.max_thrust, ISP, G0,
+            ATM_DENSITY_MARS, self.cd, self.area, GRAVITY_MARS)
         return True
 
 def main():
     pygame.init()
     screen = pygame.display.set_mode((400, 700))
-    clock = pygame.time.Clock()
     
     # Inicialización basada en tu perfil de Ingeniería Aeroespacial [cite: 5]
     rocket = RocketSimulation(altitude=1000.0, velocity=-10.0, dry_mass=500.0, fuel_mass=600.0)
     # Control de velocidad para aterrizaje suave (Vertical Landing)
     controller = PIDController(kp=1200, ki=20, kd=800, setpoint=-2.0)
+    # Compilar el núcleo Numba ahora (paso con dt=0, resultado descartado)
+    # para que el primer frame no arrastre el tiempo de compilación
+    step_rocket(rocket.y, rocket.v, rocket.m_fuel, 0.0, 0.0,
+                rocket.m_dry, rocket.max_thrust, ISP, G0,
+                ATM_DENSITY_MARS, rocket.cd, rocket.area, GRAVITY_MARS)
+
+    # Fondo estático (espacio + Marte): se dibuja una sola vez
+    screen.fill(BG_COLOR)
+    screen.fill(MARS_COLOR, MARS_RECT)
+    pygame.display.flip()
+    rocket_rect = pygame.Rect(190, 650, 20, 40)
+    last_log_band = None
 
+    clock = pygame.time.Clock()
     running = True
     while running:
         dt = clock.tick(60) / 1000.0
         if dt > 0.1: dt = 0.1
 
+        full_redraw = False
         for event in pygame.event.get():
             if event.type == pygame.QUIT: running = False
+            # Ventana descubierta/restaurada: hay que presentar el frame completo
+            elif event.type in (pygame.WINDOWEXPOSED, pygame.VIDEOEXPOSE): full_redraw = True
 
         # Lógica de Control: Compensación de Gravedad + Salida PID
         current_weight = (rocket.m_dry + rocket.m_fuel) * GRAVITY_MARS
@@ -91,18 +97,26 @@ def main():
         rocket.update_physics(thrust_cmd, dt)
 
         # Rendering Minimalista (Estilo Dashboard de Telemetría)
-        screen.fill((10, 10, 15))
-        # Dibujar Marte
-        pygame.draw.rect(screen, (135, 62, 35), (0, 650, 400, 50))
+        # Dirty rects: solo se repinta la zona que ocupaba el cohete y la nueva
+        prev_rect = rocket_rect
+        screen.fill(BG_COLOR, prev_rect)
+        screen.fill(MARS_COLOR, prev_rect.clip(MARS_RECT))
         # Dibujar Cohete (Escalado simple)
         rocket_py = 650 - (rocket.y * 0.6)
-        pygame.draw.rect(screen, (200, 200, 200), (190, rocket_py, 20, 40))
+        rocket_rect = pygame.Rect(190, rocket_py, 20, 40)
+        pygame.draw.rect(screen, (200, 200, 200), rocket_rect)
         
         # Telemetría en consola (Cero Complacencia: Monitorea tus estados)
-        if int(rocket.y) % 10 == 0:
+        # Solo al cruzar una franja de 10 m, no en cada frame dentro de ella
+        log_band = int(rocket.y) // 10
+        if log_band != last_log_band:
+            last_log_band = log_band
             print(f"Alt: {rocket.y:.1f}m | Vel: {rocket.v:.1f}m/s | Fuel: {rocket.m_fuel:.1f}kg")
 
-        pygame.display.flip()
+        if full_redraw:
+            pygame.display.flip()
+        else:
+            pygame.display.update([prev_rect, rocket_rect])
 
     pygame.quit()
 